@@ -2,7 +2,10 @@ import os
 from datetime import time
 from dotenv import load_dotenv
 
-load_dotenv('environment.env')
+# Parse environment.env only once per process, and only when it exists
+if not os.getenv('ENV_LOADED') and os.path.exists('environment.env'):
+    load_dotenv('environment.env')
+    os.environ['ENV_LOADED'] = '1'
 
 class Config:
     # Database
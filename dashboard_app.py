@@ -1,16 +1,61 @@
 # dashboard_app.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 import logging
 import json
+import os
 import re
+from openpyxl import load_workbook
+from pandas.io.parsers import TextParser
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DATA_FILE = "data_ORCIDs_CORRECTED.xlsx"
+PARQUET_CACHE_DIR = "cache"
+ORCID_PARQUET = os.path.join(PARQUET_CACHE_DIR, "orcid.parquet")
+PUBLICATIONS_PARQUET = os.path.join(PARQUET_CACHE_DIR, "publications.parquet")
+PARQUET_SOURCE_STAMP = os.path.join(PARQUET_CACHE_DIR, "source_stamp.txt")
+STYLE_FILE = "style.css"
+
+# Regexes for text/DOI cleaning, compiled once. Passing compiled patterns to .str.replace
+# also keeps Python's re semantics (e.g. Unicode \w) on Arrow-backed string columns.
+WHITESPACE_RE = re.compile(r'\s+')
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+DOI_URL_RE = re.compile(r'^https?://doi\.org/')
+DOI_PREFIX_RE = re.compile(r'^doi:')
+ORCID_ID_RE = re.compile(r'^(?:https?://orcid\.org/)?\d{4}-\d{4}-\d{4}-\d{3}[\dX]$')
+
+# Columns read back from the Parquet cache (the only ones the dashboard uses)
+ORCID_COLUMNS = ('name', 'orcid', 'department', 'college', 'university', 'publications_count', 'orcid_valid')
+PUBLICATION_COLUMNS = ('researcher_name', 'department', 'college', 'university', 'title', 'doi', 'year', 'journal')
+
+# Fields copied from each entry of the publication_details JSON column
+PUBLICATION_FIELDS = ('title', 'doi', 'year', 'journal', 'url')
+
+# Low-cardinality text columns stored as pandas categoricals after loading
+CATEGORY_COLUMNS = ('university', 'college', 'department', 'journal')
+
+# High-cardinality text columns stored as Arrow-backed strings after loading
+TEXT_COLUMNS = ('name', 'researcher_name', 'orcid', 'title', 'doi', 'url')
+
+# Data Status filter options mapped to the boolean flag columns precomputed on the ORCID frame
+DATA_FILTER_FLAGS = {
+    "Valid ORCID Only": '_valid_orcid',
+    "With Publications": '_has_pubs',
+    "High Publication Count (10+)": '_high_pubs'
+}
+
 # Page configuration
 st.set_page_config(
     page_title="ScienceBase - Research Analytics",
@@ -19,131 +64,20 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for professional styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 1rem;
-        font-family: 'Arial', sans-serif;
-    }
-    
-    .logo {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #ff6b6b;
-        text-align: center;
-        margin-bottom: 0.5rem;
-    }
-    
-    .subheader {
-        font-size: 1.5rem;
-        color: #2c3e50;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: 300;
-    }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-        padding: 1.5rem;
-        border-radius: 15px;
-        margin: 0.5rem 0;
-        border-left: 5px solid #667eea;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }
-    
-    .sidebar .sidebar-content {
-        background: linear-gradient(180deg, #f8f9fa 0%, #e9ecef 100%);
-    }
-    
-    .footer {
-        text-align: center;
-        padding: 1rem;
-        margin-top: 2rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        font-size: 0.9rem;
-    }
-    
-    .filter-section {
-        background: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-    }
-    
-    .chart-container {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin-bottom: 1.5rem;
-    }
-    
-    .dataframe {
-        border-radius: 10px;
-        overflow: hidden;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }
-    
-    .validation-card {
-        background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        border-left: 5px solid #ffc107;
-    }
-    
-    .data-card {
-        background: linear-gradient(135deg, #a5d6a7 0%, #66bb6a 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        border-left: 5px solid #2e7d32;
-        color: white;
-    }
-    
-    .data-filter-card {
-        background: linear-gradient(135deg, #e3f2fd 0%, #bbdefb 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        border-left: 5px solid #2196f3;
-    }
-    
-    .data-badge {
-        background: linear-gradient(135deg, #66bb6a 0%, #2e7d32 100%);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        font-weight: bold;
-        display: inline-block;
-        margin: 0.2rem;
-    }
-    
-    .copyright {
-        font-size: 0.8rem;
-        color: #e0e0e0;
-        margin-top: 0.5rem;
-    }
-    
-    .publication-details {
-        background: linear-gradient(135deg, #fff3e0 0%, #ffe0b2 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        border-left: 5px solid #ff9800;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource(show_spinner=False)
+def _load_css():
+    """Read the custom stylesheet once per server process"""
+    try:
+        with open(STYLE_FILE, encoding='utf-8') as f:
+            return f"<style>\n{f.read()}\n</style>"
+    except OSError as e:
+        logger.warning(f"Could not load {STYLE_FILE}: {e}")
+        return ""
+
+# Custom CSS for professional styling (Streamlit drops elements that are not re-sent, so emit it on every run)
+custom_css = _load_css()
+if custom_css:
+    st.markdown(custom_css, unsafe_allow_html=True)
 
 def clean_text(text):
     """Clean and normalize text for shared publication detection"""
@@ -152,8 +86,8 @@ def clean_text(text):
     
     text = str(text).lower().strip()
     # Remove extra spaces, special characters, and normalize
-    text = re.sub(r'\s+', ' ', text)  # Replace multiple spaces with single space
-    text = re.sub(r'[^\w\s]', '', text)  # Remove punctuation
+    text = WHITESPACE_RE.sub(' ', text)  # Replace multiple spaces with single space
+    text = PUNCTUATION_RE.sub('', text)  # Remove punctuation
     return text
 
 def clean_doi(doi):
@@ -163,54 +97,79 @@ def clean_doi(doi):
     
     doi = str(doi).lower().strip()
     # Remove common DOI prefixes and URLs
-    doi = re.sub(r'^https?://doi\.org/', '', doi)
-    doi = re.sub(r'^doi:', '', doi)
-    doi = re.sub(r'^\s*', '', doi)
-    doi = re.sub(r'\s*$', '', doi)
-    return doi
+    doi = DOI_URL_RE.sub('', doi)
+    doi = DOI_PREFIX_RE.sub('', doi)
+    return doi.strip()
+
+def clean_text_series(texts):
+    """Vectorized clean_text over a whole Series using pandas string methods"""
+    texts = texts.astype('string').str.lower().str.strip()
+    texts = texts.str.replace(WHITESPACE_RE, ' ', regex=True)  # Replace multiple spaces with single space
+    texts = texts.str.replace(PUNCTUATION_RE, '', regex=True)  # Remove punctuation
+    return texts.fillna('')
+
+def clean_doi_series(dois):
+    """Vectorized clean_doi over a whole Series using pandas string methods"""
+    dois = dois.astype('string').str.lower().str.strip()
+    # Remove common DOI prefixes and URLs
+    dois = dois.str.replace(DOI_URL_RE, '', regex=True)
+    dois = dois.str.replace(DOI_PREFIX_RE, '', regex=True)
+    return dois.str.strip().fillna('')
 
-def count_unique_publications(publication_df):
+def truncate_series(texts, max_length):
+    """Vectorized truncation: cut strings longer than max_length and append '...'"""
+    # Slice to one character past the limit first so length checks never scan long strings
+    sliced = texts.astype(str).str.slice(0, max_length + 1)
+    return sliced.where(sliced.str.len() <= max_length, sliced.str.slice(0, max_length) + '...')
+
+def count_unique_publications(publication_df, return_frame=True):
     """Count unique publications by removing DOI and title shared publications"""
     if publication_df.empty:
         return 0, 0, pd.DataFrame()
     
     try:
-        # Create a copy to avoid modifying original data
-        df = publication_df.copy()
-        
-        # Clean the data for shared publication detection
-        df['doi_clean'] = df['doi'].apply(clean_doi)
-        df['title_clean'] = df['title'].apply(clean_text)
-        df['journal_clean'] = df['journal'].apply(clean_text)
-        
-        # Fill NaN years with empty string
-        df['year_clean'] = df['year'].fillna('').astype(str)
-        
-        # Step 1: Remove shared publications by DOI (most reliable)
-        df_no_doi_shared = df.drop_duplicates(subset=['doi_clean'], keep='first')
-        doi_shared_removed = len(df) - len(df_no_doi_shared)
+        # Drop DOI shared publications first (most reliable); every record left with a DOI is then unique
+        if 'doi_clean' in publication_df.columns:
+            doi_clean = publication_df['doi_clean']
+        else:
+            doi_clean = clean_doi_series(publication_df['doi'])
+        has_doi = (doi_clean != '').to_numpy()
+        doi_shared = has_doi & doi_clean.duplicated(keep='first').to_numpy()
+        doi_unique = has_doi & ~doi_shared
+        
+        # Only records without a DOI need their text cleaned for shared publication detection
+        no_doi = publication_df[~has_doi]
+        title_clean = clean_text_series(no_doi['title'])
+        composite = pd.DataFrame({
+            'title_clean': title_clean,
+            'journal_clean': clean_text_series(no_doi['journal']),
+            'year_clean': no_doi['year'].fillna('').astype(str)
+        })
         
-        # Step 2: From remaining, remove shared publications by title + journal + year
         # Only consider titles that are not empty or too short
-        valid_titles = df_no_doi_shared[
-            (df_no_doi_shared['title_clean'].str.len() > 10) &
-            (df_no_doi_shared['title_clean'] != 'unknown title') &
-            (df_no_doi_shared['title_clean'] != '')
-        ]
+        valid_titles = ((title_clean.str.len() > 10) & (title_clean != 'unknown title')).to_numpy()
+        composite = composite[valid_titles]
         
-        # Remove shared publications based on title + journal + year combination
-        unique_publications = valid_titles.drop_duplicates(
-            subset=['title_clean', 'journal_clean', 'year_clean'], 
-            keep='first'
-        )
+        # Single 64-bit key over title + journal + year; keep the first occurrence of each key
+        composite_hash = pd.util.hash_pandas_object(composite, index=False).to_numpy()
+        _, first_index = np.unique(composite_hash, return_index=True)
         
-        # Count publications that were removed by title deduplication
-        title_shared_removed = len(valid_titles) - len(unique_publications)
+        # Count removed publications per key type
+        doi_shared_removed = int(doi_shared.sum())
+        title_shared_removed = len(composite_hash) - len(first_index)
         
         # Total unique publications
-        total_unique = len(unique_publications)
+        total_unique = int(doi_unique.sum()) + len(first_index)
         total_shared_removed = doi_shared_removed + title_shared_removed
         
+        # Only materialize the deduplicated frame when the caller needs it
+        if return_frame:
+            keep = doi_unique.copy()
+            keep[np.flatnonzero(~has_doi)[np.flatnonzero(valid_titles)[first_index]]] = True
+            unique_publications = publication_df[keep]
+        else:
+            unique_publications = pd.DataFrame()
+        
         logger.info(f"Unique publications: {total_unique} (DOI shared: {doi_shared_removed}, Title shared: {title_shared_removed})")
         
         return total_unique, total_shared_removed, unique_publications
@@ -219,65 +178,295 @@ def count_unique_publications(publication_df):
         logger.error(f"Error counting unique publications: {e}")
         # Fallback: simple unique count by DOI only
         try:
-            unique_dois = df['doi_clean'][df['doi_clean'] != ''].nunique()
-            return unique_dois, len(df) - unique_dois, pd.DataFrame()
+            unique_dois = doi_clean[doi_clean != ''].nunique()
+            return unique_dois, len(publication_df) - unique_dois, pd.DataFrame()
         except:
-            return len(df), 0, pd.DataFrame()
+            return len(publication_df), 0, pd.DataFrame()
+
+def get_data_version():
+    """Return the modification time of data_ORCIDs_CORRECTED.xlsx, used to invalidate cached data"""
+    try:
+        return os.path.getmtime(DATA_FILE)
+    except OSError:
+        return None
+
+def _sheet_to_frame(ws):
+    """Stream a read-only worksheet into a DataFrame, first row as header (same type inference as read_excel)"""
+    # TextParser accepts the row tuples as-is, so no per-row list copy is made
+    rows = list(ws.iter_rows(values_only=True))
+    with TextParser(rows, header=0) as parser:
+        return parser.read()
+
+def _read_workbook_sheets():
+    """Read the main and Publication_Details sheets of data_ORCIDs_CORRECTED.xlsx in a single read-only pass"""
+    wb = load_workbook(DATA_FILE, read_only=True, data_only=True)
+    try:
+        orcid_df = _sheet_to_frame(wb.worksheets[0])
+        if 'Publication_Details' in wb.sheetnames:
+            publication_df = _sheet_to_frame(wb['Publication_Details'])
+        else:
+            publication_df = None
+    finally:
+        wb.close()
+    return orcid_df, publication_df
+
+def _source_stamp():
+    """Return the mtime and size of data_ORCIDs_CORRECTED.xlsx as recorded next to the Parquet cache"""
+    stat = os.stat(DATA_FILE)
+    return f"{stat.st_mtime_ns} {stat.st_size}"
+
+def _ensure_parquet():
+    """Convert data_ORCIDs_CORRECTED.xlsx to the Parquet cache when the cache is missing or stale"""
+    # Compare for equality, not recency: a restored backup can carry an older mtime
+    stamp = _source_stamp()
+    try:
+        with open(PARQUET_SOURCE_STAMP) as f:
+            cached_stamp = f.read()
+    except OSError:
+        cached_stamp = None
+    if cached_stamp == stamp and os.path.exists(ORCID_PARQUET):
+        return
+    
+    orcid_df, publication_df = _read_workbook_sheets()
+    os.makedirs(PARQUET_CACHE_DIR, exist_ok=True)
+    if publication_df is not None:
+        publication_df.to_parquet(PUBLICATIONS_PARQUET, engine="pyarrow", compression="zstd")
+    elif os.path.exists(PUBLICATIONS_PARQUET):
+        os.remove(PUBLICATIONS_PARQUET)
+    orcid_df.to_parquet(ORCID_PARQUET, engine="pyarrow", compression="zstd")
+    # Written last so it only marks a complete conversion
+    with open(PARQUET_SOURCE_STAMP, "w") as f:
+        f.write(stamp)
+    logger.info(f"Converted {DATA_FILE} to Parquet cache in {PARQUET_CACHE_DIR}/")
+
+def _read_parquet_columns(path, columns):
+    """Read only the given columns of a Parquet cache file, skipping any the file does not have"""
+    import pyarrow.parquet as pq
+    available = set(pq.read_schema(path).names)
+    return pd.read_parquet(path, engine="pyarrow", columns=[col for col in columns if col in available])
+
+def _load_workbook():
+    """Load both sheets of data_ORCIDs_CORRECTED.xlsx via the Parquet cache"""
+    try:
+        _ensure_parquet()
+        if os.path.exists(PUBLICATIONS_PARQUET):
+            orcid_df = _read_parquet_columns(ORCID_PARQUET, ORCID_COLUMNS)
+            publication_df = _read_parquet_columns(PUBLICATIONS_PARQUET, PUBLICATION_COLUMNS)
+        else:
+            # No Publication_Details sheet: keep the JSON column the fallback extracts publications from
+            orcid_df = _read_parquet_columns(ORCID_PARQUET, ORCID_COLUMNS + ('publication_details',))
+            publication_df = None
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        logger.warning(f"Parquet cache unavailable, reading {DATA_FILE} directly: {e}")
+        orcid_df, publication_df = _read_workbook_sheets()
+        # Keep the same columns the Parquet path projects, so the shared frames stay small
+        if publication_df is not None:
+            orcid_df = orcid_df[[col for col in ORCID_COLUMNS if col in orcid_df.columns]]
+            publication_df = publication_df[[col for col in PUBLICATION_COLUMNS if col in publication_df.columns]]
+        else:
+            orcid_df = orcid_df[[col for col in ORCID_COLUMNS + ('publication_details',) if col in orcid_df.columns]]
+    logger.info(f"Successfully loaded data from {DATA_FILE} with {len(orcid_df)} records")
+    return orcid_df, publication_df
+
+def _to_categories(df):
+    """Convert low-cardinality text columns to category dtype so filters and groupbys work on integer codes"""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            try:
+                df[col] = df[col].astype('category')
+            except TypeError:
+                # e.g. journal entries parsed from JSON as {'value': ...} dicts are unhashable
+                pass
+    return df
+
+def _to_strings(df, columns=TEXT_COLUMNS):
+    """Convert free-text columns to Arrow-backed strings so .str operations run in Arrow kernels"""
+    try:
+        string_dtype = pd.StringDtype("pyarrow")
+    except ImportError:
+        string_dtype = pd.StringDtype("python")
+    for col in columns:
+        if col in df.columns:
+            df[col] = df[col].astype(string_dtype)
+    return df
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _read_orcid_data(data_version):
+    """Read the main sheet of data_ORCIDs_CORRECTED.xlsx (one shared frame per file version; callers must not modify it in place)"""
+    orcid_df, _ = _load_workbook()
+    if 'orcid_valid' in orcid_df.columns:
+        orcid_df['orcid_valid'] = orcid_df['orcid_valid'].fillna(False).astype(bool)
+    elif 'orcid' in orcid_df.columns:
+        # Older sheets have no orcid_valid column: derive it once here from the ORCID iD format
+        orcid_df['orcid_valid'] = orcid_df['orcid'].astype('string').str.strip().str.match(ORCID_ID_RE, na=False).to_numpy(dtype=bool)
+    if 'orcid_valid' in orcid_df.columns:
+        orcid_df['_valid_orcid'] = orcid_df['orcid_valid'] == True
+    if 'publications_count' in orcid_df.columns:
+        # Counts stay in the hundreds, so int16 is plenty and quarters the bytes every filter scans
+        orcid_df['publications_count'] = pd.to_numeric(orcid_df['publications_count'], errors='coerce').fillna(0).astype('int16')
+        orcid_df['_has_pubs'] = orcid_df['publications_count'] > 0
+        orcid_df['_high_pubs'] = orcid_df['publications_count'] >= 10
+    return _to_categories(_to_strings(orcid_df))
 
 def get_orcid_data():
     """Load ORCID data ONLY from data_ORCIDs_CORRECTED.xlsx"""
     try:
-        orcid_df = pd.read_excel("data_ORCIDs_CORRECTED.xlsx")
-        logger.info(f"Successfully loaded data from data_ORCIDs_CORRECTED.xlsx with {len(orcid_df)} records")
-        return orcid_df
+        return _read_orcid_data(get_data_version())
     except Exception as e:
         logger.error(f"Error loading data_ORCIDs_CORRECTED.xlsx: {e}")
         st.error("❌ data_ORCIDs_CORRECTED.xlsx not found or cannot be loaded. Please ensure the file exists.")
         return pd.DataFrame()
 
-def get_publication_details():
-    """Load publication details ONLY from data_ORCIDs_CORRECTED.xlsx"""
+def _prepare_publication_details(publication_df):
+    """Parse years, clean DOIs and categorize low-cardinality columns once at load time"""
+    if 'year' in publication_df.columns:
+        publication_df['year_numeric'] = pd.to_numeric(publication_df['year'], errors='coerce').astype('Int16')
+    if 'doi' in publication_df.columns:
+        publication_df['doi_clean'] = clean_doi_series(publication_df['doi'])
+    return _to_categories(_to_strings(publication_df))
+
+def parse_publication_details(details):
+    """Parse a publication_details JSON cell, returning an empty list for blank or invalid values"""
+    details = str(details).strip()
+    if not details or details == 'nan' or details == 'None':
+        return []
+    try:
+        return json_loads(details)
+    except json.JSONDecodeError:
+        return []
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _read_publication_details(data_version):
+    """Read publication details from data_ORCIDs_CORRECTED.xlsx (one shared frame per file version; callers must not modify it in place)"""
     try:
         # Try to load from the Publication_Details sheet
-        publication_df = pd.read_excel("data_ORCIDs_CORRECTED.xlsx", sheet_name='Publication_Details')
+        _, publication_df = _load_workbook()
+        if publication_df is None:
+            raise ValueError("Worksheet named 'Publication_Details' not found")
         logger.info(f"Successfully loaded publication details with {len(publication_df)} records")
-        return publication_df
+        return _prepare_publication_details(publication_df)
     except Exception as e:
         logger.warning(f"Could not load publication details sheet: {e}")
         # Try to extract from publication_details column in main sheet
         try:
             orcid_df = get_orcid_data()
             if not orcid_df.empty and 'publication_details' in orcid_df.columns:
-                all_publications = []
-                for index, row in orcid_df.iterrows():
-                    if row['orcid_valid'] and pd.notna(row['publication_details']):
-                        try:
-                            publication_details_str = str(row['publication_details']).strip()
-                            if publication_details_str and publication_details_str != 'nan' and publication_details_str != 'None':
-                                publications = json.loads(publication_details_str)
-                                for pub in publications:
-                                    pub_detail = {
-                                        'researcher_name': row['name'],
-                                        'orcid': row['orcid'],
-                                        'department': row.get('department', ''),
-                                        'college': row.get('college', ''),
-                                        'university': row.get('university', ''),
-                                        'title': pub.get('title', ''),
-                                        'doi': pub.get('doi', ''),
-                                        'year': pub.get('year', ''),
-                                        'journal': pub.get('journal', ''),
-                                        'url': pub.get('url', '')
-                                    }
-                                    all_publications.append(pub_detail)
-                        except json.JSONDecodeError:
-                            continue
-                publication_df = pd.DataFrame(all_publications)
+                valid_rows = orcid_df.loc[orcid_df['orcid_valid'] & orcid_df['publication_details'].notna()]
+                researchers = (
+                    valid_rows.reindex(columns=['name', 'orcid', 'department', 'college', 'university'], fill_value='')
+                    .rename(columns={'name': 'researcher_name'})
+                    .reset_index(drop=True)
+                )
+                parsed = [parse_publication_details(details) for details in valid_rows['publication_details']]
+                
+                # Build the publication fields as plain tuples, then attach researcher columns by row position
+                publications = pd.DataFrame(
+                    [tuple(pub.get(field, '') for field in PUBLICATION_FIELDS) for pubs in parsed for pub in pubs],
+                    columns=list(PUBLICATION_FIELDS)
+                )
+                positions = np.repeat(np.arange(len(parsed)), [len(pubs) for pubs in parsed])
+                publication_df = pd.concat([researchers.iloc[positions].reset_index(drop=True), publications], axis=1)
                 logger.info(f"Extracted {len(publication_df)} publication details from main sheet")
-                return publication_df
+                return _prepare_publication_details(publication_df)
         except Exception as e2:
             logger.error(f"Error extracting publication details: {e2}")
     return pd.DataFrame()
 
+def get_publication_details():
+    """Load publication details ONLY from data_ORCIDs_CORRECTED.xlsx"""
+    return _read_publication_details(get_data_version())
+
+def _sorted_options(series):
+    """Sorted distinct values of a column; categoricals already keep their categories sorted"""
+    if isinstance(series.dtype, pd.CategoricalDtype) and not series.cat.ordered:
+        return series.cat.remove_unused_categories().cat.categories.tolist()
+    return sorted(series.dropna().unique().tolist())
+
+@st.cache_data(show_spinner=False)
+def get_filter_options(data_version=None):
+    """Precompute the sidebar option lists for the cascading filters (cached per file version)"""
+    orcid_df = get_orcid_data()
+    names_by_department = orcid_df.groupby(['university', 'college', 'department'], observed=True)['name'].unique()
+    return {
+        'universities': _sorted_options(orcid_df['university']),
+        'colleges': _sorted_options(orcid_df['college']),
+        'departments': _sorted_options(orcid_df['department']),
+        'names': sorted(orcid_df['name'].dropna().unique().tolist()),
+        'colleges_by_university': {k: v.tolist() for k, v in orcid_df.groupby('university', observed=True)['college'].unique().items()},
+        'departments_by_college': {k: v.tolist() for k, v in orcid_df.groupby('college', observed=True)['department'].unique().items()},
+        'names_by_department': {k: v.tolist() for k, v in names_by_department.items()}
+    }
+
+def get_dependent_options(selected, options_by_key):
+    """Sorted union of the option lists for the selected parent values"""
+    return sorted({option for key in selected for option in options_by_key.get(key, [])})
+
+@st.cache_data(show_spinner=False)
+def get_year_bounds(data_version=None):
+    """Earliest and latest publication year for the year slider (cached per file version)"""
+    publication_df = get_publication_details()
+    if not publication_df.empty and 'year_numeric' in publication_df.columns:
+        # Reuse the year parsed once at load time; min/max skip missing years
+        min_year = publication_df['year_numeric'].min()
+        max_year = publication_df['year_numeric'].max()
+        if pd.notna(min_year):
+            return int(min_year), int(max_year)
+    return 2000, datetime.now().year
+
+@st.cache_data(show_spinner=False)
+def get_overview_stats(data_version=None):
+    """Compute the top-line counts for the data overview in one pass (cached per file version)"""
+    orcid_data = get_orcid_data()
+    publication_details = get_publication_details()
+    
+    # Handle case where orcid_valid column might not exist
+    if 'orcid_valid' in orcid_data.columns:
+        valid_count = int(orcid_data['_valid_orcid'].sum())
+    else:
+        valid_count = int(orcid_data['orcid'].notna().sum())
+    
+    if 'publications_count' in orcid_data.columns:
+        total_publications = int(orcid_data['publications_count'].sum())
+        researchers_with_pubs = int(orcid_data['_has_pubs'].sum())
+    else:
+        total_publications = 0
+        researchers_with_pubs = 0
+    
+    stats = {
+        'total_researchers': len(orcid_data),
+        'valid_count': valid_count,
+        'total_publications': total_publications,
+        'researchers_with_pubs': researchers_with_pubs,
+        'total_publication_records': len(publication_details),
+        'unique_publications': 0,
+        'shared_removed': 0,
+        'publications_with_doi': 0
+    }
+    
+    if not publication_details.empty:
+        unique_publications, shared_removed, _ = count_unique_publications(publication_details, return_frame=False)
+        doi = publication_details['doi']
+        stats['unique_publications'] = unique_publications
+        stats['shared_removed'] = shared_removed
+        stats['publications_with_doi'] = int((doi.notna() & (doi != '')).sum())
+    
+    return stats
+
+def get_selection_mask(df, selections):
+    """Combine multiselect filters given as (column, selected values) pairs into one boolean mask"""
+    mask = np.ones(len(df), dtype=bool)
+    for column, selected in selections:
+        if "All" not in selected and selected:
+            if len(selected) == 1:
+                # A single selection is a plain equality test (category codes compare without hashing);
+                # on nullable string columns missing names compare as NA, which must count as no match
+                mask &= (df[column] == selected[0]).to_numpy(dtype=bool, na_value=False)
+            else:
+                mask &= df[column].isin(selected).to_numpy()
+    return mask
+
 def get_filtered_orcid_data(universities, colleges, departments, researchers, data_filter):
     """Get filtered ORCID data from data_ORCIDs_CORRECTED.xlsx with multiple selection support"""
     try:
@@ -285,34 +474,21 @@ def get_filtered_orcid_data(universities, colleges, departments, researchers, da
         if orcid_df.empty:
             return pd.DataFrame()
         
-        # Apply filters
-        filtered_df = orcid_df.copy()
-        
-        # University filter (multiple selection)
-        if "All" not in universities and universities:
-            filtered_df = filtered_df[filtered_df['university'].isin(universities)]
-            
-        # College filter (multiple selection)
-        if "All" not in colleges and colleges:
-            filtered_df = filtered_df[filtered_df['college'].isin(colleges)]
-            
-        # Department filter (multiple selection)
-        if "All" not in departments and departments:
-            filtered_df = filtered_df[filtered_df['department'].isin(departments)]
-            
-        # Researcher filter (multiple selection)
-        if "All" not in researchers and researchers:
-            filtered_df = filtered_df[filtered_df['name'].isin(researchers)]
+        # University, college, department and researcher filters (multiple selection)
+        mask = get_selection_mask(orcid_df, [
+            ('university', universities),
+            ('college', colleges),
+            ('department', departments),
+            ('name', researchers)
+        ])
         
         # Apply data filter
-        if data_filter == "Valid ORCID Only":
-            filtered_df = filtered_df[filtered_df['orcid_valid'] == True]
-        elif data_filter == "With Publications":
-            filtered_df = filtered_df[filtered_df['publications_count'] > 0]
-        elif data_filter == "High Publication Count (10+)":
-            filtered_df = filtered_df[filtered_df['publications_count'] >= 10]
+        flag_col = DATA_FILTER_FLAGS.get(data_filter)
+        if flag_col:
+            mask &= orcid_df[flag_col].to_numpy()
         
-        return filtered_df
+        # Slice once with the combined mask; with nothing filtered out (the default "All" view) skip the copy
+        return orcid_df if mask.all() else orcid_df[mask]
         
     except Exception as e:
         logger.error(f"Error filtering ORCID data: {str(e)}")
@@ -325,63 +501,42 @@ def get_filtered_publication_details(universities, colleges, departments, resear
         if publication_df.empty:
             return pd.DataFrame()
         
-        # Apply filters
-        filtered_df = publication_df.copy()
-        
-        # University filter (multiple selection)
-        if "All" not in universities and universities:
-            filtered_df = filtered_df[filtered_df['university'].isin(universities)]
-            
-        # College filter (multiple selection)
-        if "All" not in colleges and colleges:
-            filtered_df = filtered_df[filtered_df['college'].isin(colleges)]
-            
-        # Department filter (multiple selection)
-        if "All" not in departments and departments:
-            filtered_df = filtered_df[filtered_df['department'].isin(departments)]
-            
-        # Researcher filter (multiple selection)
-        if "All" not in researchers and researchers:
-            filtered_df = filtered_df[filtered_df['researcher_name'].isin(researchers)]
+        # University, college, department and researcher filters (multiple selection)
+        mask = get_selection_mask(publication_df, [
+            ('university', universities),
+            ('college', colleges),
+            ('department', departments),
+            ('researcher_name', researchers)
+        ])
         
         # Apply year range filter
         if year_range[0] is not None and year_range[1] is not None:
-            # Convert year column to numeric, handling errors
-            filtered_df['year_numeric'] = pd.to_numeric(filtered_df['year'], errors='coerce')
-            filtered_df = filtered_df[
-                (filtered_df['year_numeric'] >= year_range[0]) & 
-                (filtered_df['year_numeric'] <= year_range[1])
-            ]
+            # Compare on the raw array of years parsed at load time (NaN never matches)
+            years = publication_df['year_numeric'].to_numpy(dtype=float, na_value=np.nan)
+            mask &= (years >= year_range[0]) & (years <= year_range[1])
         
-        # Apply data filter based on researcher data
-        orcid_data = get_orcid_data()
-        if not orcid_data.empty:
-            if data_filter == "Valid ORCID Only":
-                valid_researchers = orcid_data[orcid_data['orcid_valid'] == True]['name'].tolist()
-                filtered_df = filtered_df[filtered_df['researcher_name'].isin(valid_researchers)]
-            elif data_filter == "With Publications":
-                researchers_with_pubs = orcid_data[orcid_data['publications_count'] > 0]['name'].tolist()
-                filtered_df = filtered_df[filtered_df['researcher_name'].isin(researchers_with_pubs)]
-            elif data_filter == "High Publication Count (10+)":
-                high_pub_researchers = orcid_data[orcid_data['publications_count'] >= 10]['name'].tolist()
-                filtered_df = filtered_df[filtered_df['researcher_name'].isin(high_pub_researchers)]
+        # Apply data filter based on researcher data (the precomputed flag column, folded into the same mask)
+        flag_col = DATA_FILTER_FLAGS.get(data_filter)
+        if flag_col:
+            orcid_data = get_orcid_data()
+            if not orcid_data.empty:
+                flagged_names = orcid_data.loc[orcid_data[flag_col], 'name'].unique()
+                mask &= publication_df['researcher_name'].isin(flagged_names).to_numpy()
         
-        return filtered_df
+        # Slice once with the combined mask; with nothing filtered out (the default "All" view) skip the copy
+        return publication_df if mask.all() else publication_df[mask]
         
     except Exception as e:
         logger.error(f"Error filtering publication details: {str(e)}")
         return pd.DataFrame()
 
-def get_researcher_metrics(universities, colleges, departments, researchers, data_filter):
-    """Calculate metrics based on filtered data from data_ORCIDs_CORRECTED.xlsx"""
-    filtered_df = get_filtered_orcid_data(universities, colleges, departments, researchers, data_filter)
-    
+def get_researcher_metrics(filtered_df):
+    """Calculate metrics from the already filtered ORCID data"""
     if filtered_df.empty:
         return pd.DataFrame(), {}
     
     # Calculate metrics per researcher
-    researcher_metrics = filtered_df[['name', 'department', 'college', 'university', 'publications_count']].copy()
-    researcher_metrics = researcher_metrics.rename(columns={
+    researcher_metrics = filtered_df[['name', 'department', 'college', 'university', 'publications_count']].rename(columns={
         'publications_count': 'publications'
     })
     
@@ -395,16 +550,9 @@ def get_researcher_metrics(universities, colleges, departments, researchers, dat
     
     return researcher_metrics, totals
 
-def get_filtered_performance_metrics(universities, colleges, departments, researchers, data_filter, year_range):
+def get_filtered_performance_metrics(filtered_researchers, filtered_publications, publication_counts, unique_publications, shared_removed):
     """Get comprehensive performance metrics for filtered data that respects year range"""
-    # Get filtered researcher data
-    filtered_researchers = get_filtered_orcid_data(universities, colleges, departments, researchers, data_filter)
-    
-    # Get filtered publication details with year range
-    filtered_publications = get_filtered_publication_details(
-        universities, colleges, departments, researchers, data_filter, year_range
-    )
-    
+    # The caller has already year-filtered the publications, counted them per researcher and deduplicated them
     if filtered_researchers.empty:
         return {
             'total_publications': 0,
@@ -417,19 +565,15 @@ def get_filtered_performance_metrics(universities, colleges, departments, resear
             'publication_rate': 0
         }
     
-    # Calculate unique publications for filtered data
-    unique_publications, shared_removed, _ = count_unique_publications(filtered_publications)
-    
     # FIXED: Calculate total publications correctly
     if not filtered_publications.empty:
         # Count ALL publication records in the filtered set (before deduplication)
         total_publications = len(filtered_publications)
         
-        # Count researchers with publications in the filtered set
-        researchers_with_publications = filtered_publications['researcher_name'].nunique()
+        # The per-researcher counts have one entry per researcher with publications
+        researchers_with_publications = len(publication_counts)
         
         # Calculate average publications per researcher
-        publication_counts = filtered_publications.groupby('researcher_name').size()
         average_publications = publication_counts.mean() if len(publication_counts) > 0 else 0
         
         # Calculate publication rate
@@ -461,45 +605,370 @@ def get_filtered_performance_metrics(universities, colleges, departments, resear
         'publication_rate': publication_rate
     }
 
-def get_college_performance_over_years(universities, colleges, departments, researchers, data_filter, year_range):
-    """Get college performance data over years"""
-    filtered_publications = get_filtered_publication_details(
-        universities, colleges, departments, researchers, data_filter, year_range
-    )
+def get_college_performance_over_years(filtered_publications):
+    """Get college performance data over years from the already filtered publications"""
+    if filtered_publications.empty:
+        return pd.DataFrame()
+    
+    # Group by college and year, count publications (groupby drops missing years and returns the keys sorted)
+    college_performance = filtered_publications.groupby(['college', 'year_numeric'], observed=True).size().reset_index(name='publications')
     
+    return college_performance
+
+def get_department_performance_over_years(filtered_publications, top_n=10):
+    """Get department performance data over years for the top_n departments by publications"""
     if filtered_publications.empty:
         return pd.DataFrame()
     
-    # Convert year to numeric and filter out invalid years
-    filtered_publications['year_numeric'] = pd.to_numeric(filtered_publications['year'], errors='coerce')
-    filtered_publications = filtered_publications[filtered_publications['year_numeric'].notna()]
+    # Group by department and year, count publications (groupby drops missing years and returns the keys sorted)
+    department_performance = filtered_publications.groupby(['department', 'year_numeric'], observed=True).size().reset_index(name='publications')
     
-    # Group by college and year, count publications
-    college_performance = filtered_publications.groupby(['college', 'year_numeric']).size().reset_index(name='publications')
-    college_performance = college_performance.sort_values(['college', 'year_numeric'])
+    # Limit to the top departments here so only the rows that are drawn leave the cached context
+    if top_n:
+        top_departments = department_performance.groupby('department', observed=True)['publications'].sum().nlargest(top_n).index
+        department_performance = department_performance[department_performance['department'].isin(top_departments)].reset_index(drop=True)
     
-    return college_performance
+    return department_performance
 
-def get_department_performance_over_years(universities, colleges, departments, researchers, data_filter, year_range):
-    """Get department performance data over years"""
+@st.cache_data(show_spinner=False, max_entries=64)
+def get_dashboard_context(universities, colleges, departments, researchers, data_filter, year_range, data_version=None):
+    """Filter once and derive every frame and metric the main view needs (cached per filter selection and file version)"""
+    filtered_data = get_filtered_orcid_data(universities, colleges, departments, researchers, data_filter)
+    researcher_metrics, _ = get_researcher_metrics(filtered_data)
+    
+    # Publication details with year range, and their unique count
     filtered_publications = get_filtered_publication_details(
         universities, colleges, departments, researchers, data_filter, year_range
     )
+    unique_publications, shared_removed, _ = count_unique_publications(filtered_publications, return_frame=False)
     
+    # Year-filtered publications per researcher (sorted by name), shared by the metrics, histogram and rankings
     if filtered_publications.empty:
-        return pd.DataFrame()
+        publication_counts = pd.Series(dtype='int64')
+    else:
+        publication_counts = filtered_publications.groupby('researcher_name').size()
+    year_filtered_publications = researcher_metrics['name'].map(publication_counts).fillna(0).astype('int32') if not researcher_metrics.empty else pd.Series(dtype='int32')
     
-    # Convert year to numeric and filter out invalid years
-    filtered_publications['year_numeric'] = pd.to_numeric(filtered_publications['year'], errors='coerce')
-    filtered_publications = filtered_publications[filtered_publications['year_numeric'].notna()]
+    return {
+        'filtered_data': filtered_data,
+        'researcher_metrics': researcher_metrics,
+        'filtered_publications': filtered_publications,
+        'publication_counts': publication_counts,
+        'year_filtered_publications': year_filtered_publications,
+        'unique_publications': unique_publications,
+        'shared_removed': shared_removed,
+        'performance_metrics': get_filtered_performance_metrics(
+            filtered_data, filtered_publications, publication_counts, unique_publications, shared_removed
+        ),
+        'college_performance': get_college_performance_over_years(filtered_publications),
+        'department_performance': get_department_performance_over_years(filtered_publications)
+    }
+
+def plotly_chart(fig, key):
+    """Show a figure under a stable key; uirevision keeps zoom and legend state across reruns so Plotly updates instead of redrawing"""
+    fig.update_layout(uirevision=key)
+    st.plotly_chart(fig, use_container_width=True, key=key)
+
+def chart_container(title=None):
+    """Bordered container for a chart panel, with an optional markdown header inside it"""
+    container = st.container(border=True)
+    if title:
+        container.markdown(title)
+    return container
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _build_publication_histogram(counts, column, title):
+    """Build the publication count histogram (cached on the counts so reruns skip the Plotly build)"""
+    # Bin on the server so only the 20 bars are sent to the browser, not one value per researcher
+    hist, edges = np.histogram(np.asarray(counts, dtype=float), bins=20)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=hist,
+        width=np.diff(edges),
+        marker_color='#00A36C'
+    ))
+    fig.update_layout(title=title, height=400, showlegend=False, bargap=0.05, xaxis_title=column, yaxis_title="count")
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _build_department_bar(dept_publications, title):
+    """Build the top departments bar chart from (department, publications) pairs"""
+    # At most ten rows: one colour-mapped trace built directly instead of going through plotly express
+    departments = [department for department, _ in dept_publications]
+    publications = [count for _, count in dept_publications]
+    fig = go.Figure(go.Bar(
+        x=publications,
+        y=departments,
+        orientation='h',
+        marker=dict(color=publications, colorscale='viridis', showscale=True,
+                    colorbar=dict(title='publications'))
+    ))
+    fig.update_layout(height=400, showlegend=False, title=title,
+                      xaxis_title='publications', yaxis_title='department')
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _build_validation_pie(values, names):
+    """Build the profile validation pie chart from the status counts"""
+    fig = px.pie(
+        values=values,
+        names=names,
+        title="Profile Validation Status",
+        color_discrete_sequence=['#00A36C', '#FF6B6B']
+    )
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _build_trend_chart(performance, group_column, title, legend_title):
+    """Build a publications-per-year line chart with one WebGL trace per group"""
+    fig = go.Figure()
+    for name, group in performance.groupby(group_column, observed=True):
+        fig.add_trace(go.Scattergl(
+            x=group['year_numeric'].to_numpy(dtype=int),
+            y=group['publications'].to_numpy(),
+            mode='lines+markers',
+            name=name
+        ))
+    fig.update_layout(
+        title=title,
+        height=400,
+        xaxis_title="Year",
+        yaxis_title="Number of Publications",
+        legend_title=legend_title
+    )
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_publication_display(publication_df):
+    """Build the sorted, cleaned publication details table (cached so reruns skip the sort and string work)"""
+    # Select and rename columns for display
+    display_columns = ['researcher_name', 'title', 'journal', 'year', 'doi']
+    available_columns = [col for col in display_columns if col in publication_df.columns]
     
-    # Group by department and year, count publications
-    department_performance = filtered_publications.groupby(['department', 'year_numeric']).size().reset_index(name='publications')
-    department_performance = department_performance.sort_values(['department', 'year_numeric'])
+    publication_display_df = publication_df[available_columns]
     
-    return department_performance
+    # Sort once on the numeric year (missing years last), before Year is turned into display strings;
+    # only the row order is computed on the full frame, so just the display columns get reordered
+    if 'year_numeric' in publication_df.columns:
+        order = (
+            publication_df['year_numeric'].reset_index(drop=True)
+            .sort_values(ascending=False, na_position='last', kind='stable')
+            .index.to_numpy()
+        )
+        publication_display_df = publication_display_df.iloc[order]
+        if 'year' in publication_display_df.columns:
+            # The nullable integer year prints without a '.0' suffix, so one cast and fill gives the display text
+            publication_display_df = publication_display_df.assign(
+                year=publication_df['year_numeric'].iloc[order].astype('string').fillna('N/A')
+            )
+    
+    # Rename columns for better display
+    column_rename_map = {
+        'researcher_name': 'Researcher Name',
+        'title': 'Publication Title',
+        'journal': 'Journal/Conference',
+        'year': 'Year',
+        'doi': 'DOI'
+    }
+    
+    # Only rename columns that exist
+    final_rename_map = {k: v for k, v in column_rename_map.items() if k in publication_display_df.columns}
+    publication_display_df = publication_display_df.rename(columns=final_rename_map)
+    
+    # Clean up data
+    if 'Year' in publication_display_df.columns and 'year_numeric' not in publication_df.columns:
+        publication_display_df['Year'] = publication_display_df['Year'].fillna('N/A')
+        # Convert to string and clean up
+        publication_display_df['Year'] = publication_display_df['Year'].astype(str).str.replace('.0', '', regex=False)
+    
+    if 'DOI' in publication_display_df.columns:
+        publication_display_df['DOI'] = publication_display_df['DOI'].fillna('No DOI')
+        # Truncate long DOIs for better display
+        publication_display_df['DOI'] = truncate_series(publication_display_df['DOI'], 50)
+    
+    if 'Publication Title' in publication_display_df.columns:
+        publication_display_df['Publication Title'] = publication_display_df['Publication Title'].fillna('Unknown Title')
+        # Truncate long titles for better display
+        publication_display_df['Publication Title'] = truncate_series(publication_display_df['Publication Title'], 100)
+    
+    if 'Journal/Conference' in publication_display_df.columns:
+        publication_display_df['Journal/Conference'] = publication_display_df['Journal/Conference'].astype(object).fillna('Unknown')
+        # Truncate long journal names
+        publication_display_df['Journal/Conference'] = truncate_series(publication_display_df['Journal/Conference'], 80)
+    
+    # Arrow-backed strings go to st.dataframe without a per-cell object conversion
+    return _to_strings(publication_display_df, publication_display_df.columns)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_researcher_display(filtered_data):
+    """Build the sorted, renamed researcher table (cached so reruns skip the sort and relabelling)"""
+    display_columns = ['name', 'department', 'college', 'orcid', 'publications_count']
+    if 'orcid_valid' in filtered_data.columns:
+        display_columns.append('orcid_valid')
+    
+    # Sort on the numeric count before it is renamed for display
+    display_df = filtered_data[display_columns].sort_values('publications_count', ascending=False, kind='stable')
+    
+    # Rename for clarity
+    column_rename_map = {
+        'name': 'Researcher Name',
+        'department': 'Department',
+        'college': 'College', 
+        'orcid': 'Profile ID',
+        'publications_count': 'Publications',
+        'orcid_valid': 'Profile Valid'
+    }
+    
+    # Only rename columns that exist
+    final_rename_map = {k: v for k, v in column_rename_map.items() if k in display_df.columns}
+    display_df = display_df.rename(columns=final_rename_map)
+    
+    # Format Profile Valid column if it exists
+    if 'Profile Valid' in display_df.columns:
+        display_df['Profile Valid'] = display_df['Profile Valid'].map({True: '✅ Yes', False: '❌ No'})
+        display_df = _to_strings(display_df, ('Profile Valid',))
+    
+    return display_df
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _encode_csv(df):
+    """Encode a display table as UTF-8 CSV bytes for download (cached so unchanged tables are not re-serialized)"""
+    return df.to_csv(index=False).encode('utf-8')
+
+def _request_csv(key):
+    """Button callback: remember that the user asked for this CSV"""
+    st.session_state[key] = True
+
+def _csv_download_button(df, label, file_name, key):
+    """Offer a table as CSV, serializing it only once the user has asked for the download"""
+    if st.session_state.get(key):
+        st.download_button(
+            label=label,
+            data=_encode_csv(df),
+            file_name=file_name,
+            mime="text/csv",
+            use_container_width=True
+        )
+    else:
+        st.button("⚙️ Prepare CSV Download", key=f"{key}_button", on_click=_request_csv, args=(key,), use_container_width=True)
+
+def _render_top_researchers(publication_counts, researcher_metrics):
+    """Render the top researchers chart and rankings"""
+    st.markdown("### 🏆 Top Researchers by Publication Count")
+    
+    # Use year-filtered publication counts for rankings
+    if not publication_counts.empty:
+        top_researchers = publication_counts.nlargest(10).rename_axis('researcher_name').reset_index(name='year_filtered_publications')
+        chart_title = "Top 10 Researchers by Publication Count (Year Filtered)"
+        publications_column = 'year_filtered_publications'
+    else:
+        top_researchers = researcher_metrics[['name', 'department', 'publications']].nlargest(10, 'publications')
+        chart_title = "Top 10 Researchers by Publication Count"
+        publications_column = 'publications'
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        with chart_container():
+            if not top_researchers.empty:
+                # Ten known rows: build the trace directly instead of going through plotly express
+                name_column = 'researcher_name' if 'researcher_name' in top_researchers.columns else 'name'
+                publications = top_researchers[publications_column].to_numpy()
+                fig = go.Figure(go.Bar(
+                    x=publications,
+                    y=top_researchers[name_column].to_numpy(),
+                    orientation='h',
+                    marker=dict(color=publications, colorscale='viridis', showscale=True,
+                                colorbar=dict(title=publications_column))
+                ))
+                fig.update_layout(height=500, showlegend=False, title=chart_title,
+                                  xaxis_title=publications_column, yaxis_title=name_column)
+                plotly_chart(fig, 'top_researchers')
+            else:
+                st.info("No researcher data available for current filters")
+    
+    with col2:
+        with chart_container("#### 🥇 Researcher Rankings"):
+            if not top_researchers.empty:
+                # Build all ranking cards at once and send them in a single markdown element
+                name_column = 'researcher_name' if 'researcher_name' in top_researchers.columns else 'name'
+                medals = ["🥇", "🥈", "🥉"] + [f"{i}." for i in range(4, len(top_researchers) + 1)]
+                rankings_html = "".join(
+                    f"""
+                    <div style='padding: 0.5rem; margin: 0.2rem 0; background: #f8f9fa; border-radius: 8px;'>
+                        <strong>{medal} {researcher_name}</strong><br>
+                        <span style='color: #2e7d32; font-weight: bold;'>📄 {publications_count} publications</span>
+                    </div>
+                    """
+                    for medal, researcher_name, publications_count in zip(
+                        medals, top_researchers[name_column].tolist(), top_researchers[publications_column].tolist()
+                    )
+                )
+                st.markdown(rankings_html, unsafe_allow_html=True)
+            else:
+                st.info("No researcher rankings available")
+
+@st.fragment
+def _render_publication_details(filtered_publications, unique_filtered_publications, today_tag):
+    """Render the publication details table and its CSV download (a fragment, so the download reruns only this section)"""
+    if not filtered_publications.empty:
+        st.markdown("### 📖 Publication Details")
+    
+        st.markdown(f"**Showing {len(filtered_publications)} publication records ({unique_filtered_publications} unique publications after shared publication removal)**")
+    
+        # The table and CSV are only built once asked for; the toggle reruns just this fragment
+        if st.toggle("Show publication records", key="show_publication_details"):
+            publication_display_df = _build_publication_display(filtered_publications)
+    
+            st.dataframe(
+                publication_display_df,
+                use_container_width=True,
+                height=400
+            )
+    
+            # Export option for publication details (ALL records)
+            _csv_download_button(
+                publication_display_df,
+                "📥 Download Publication Details as CSV",
+                f"publication_details_{today_tag}.csv",
+                "publication_details_csv"
+            )
+    else:
+        st.info("📖 No publication details available for the selected filters.")
+
+@st.fragment
+def _render_detailed_data(filtered_data, today_tag):
+    """Render the detailed researcher table and its CSV download (a fragment, so the download reruns only this section)"""
+    st.markdown("### 📋 Detailed Researcher Data")
+    
+    # The table and CSV are only built once asked for; the toggle reruns just this fragment
+    if not filtered_data.empty and st.toggle("Show researcher records", key="show_detailed_data"):
+        try:
+            display_df = _build_researcher_display(filtered_data)
+    
+            st.dataframe(
+                display_df,
+                use_container_width=True,
+                height=400
+            )
+    
+            # Export option
+            _csv_download_button(
+                display_df,
+                "📥 Download Research Data as CSV",
+                f"research_analytics_{today_tag}.csv",
+                "research_data_csv"
+            )
+    
+        except Exception as e:
+            st.error(f"Error preparing detailed data: {str(e)}")
+
 
 def main():
+    # Date stamp shared by both CSV export file names in this render
+    today_tag = datetime.now().strftime('%Y%m%d')
+    
     # Header Section with Logo and Branding
     col1, col2, col3 = st.columns([1, 2, 1])
     
@@ -512,70 +981,60 @@ def main():
     st.markdown("### 📊 Research Data Overview")
     
     orcid_data = get_orcid_data()
-    publication_details = get_publication_details()
     
     if not orcid_data.empty:
+        stats = get_overview_stats(get_data_version())
+        total_researchers = stats['total_researchers']
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.markdown('<div class="data-card">', unsafe_allow_html=True)
-            total_researchers = len(orcid_data)
-            st.metric("Total Researchers", f"{total_researchers:,}")
-            st.markdown('</div>', unsafe_allow_html=True)
+            with st.container(border=True):
+                st.metric("Total Researchers", f"{total_researchers:,}")
         
         with col2:
-            st.markdown('<div class="data-card">', unsafe_allow_html=True)
-            # Handle case where orcid_valid column might not exist
-            if 'orcid_valid' in orcid_data.columns:
-                valid_orcids = orcid_data[orcid_data['orcid_valid'] == True]
-            else:
-                valid_orcids = orcid_data[orcid_data['orcid'].notna()]
-            valid_count = len(valid_orcids)
-            st.metric("Valid Profiles", f"{valid_count:,}")
-            st.metric("Validation Rate", f"{(valid_count/total_researchers)*100:.1f}%")
-            st.markdown('</div>', unsafe_allow_html=True)
+            with st.container(border=True):
+                valid_count = stats['valid_count']
+                st.metric("Valid Profiles", f"{valid_count:,}")
+                st.metric("Validation Rate", f"{(valid_count/total_researchers)*100:.1f}%")
         
         with col3:
-            st.markdown('<div class="data-card">', unsafe_allow_html=True)
-            total_publications = orcid_data['publications_count'].sum() if 'publications_count' in orcid_data.columns else 0
-            st.metric("Total Publications", f"{total_publications:,}")
-            avg_pubs = total_publications / total_researchers if total_researchers > 0 else 0
-            st.metric("Avg Publications", f"{avg_pubs:.1f}")
-            st.markdown('</div>', unsafe_allow_html=True)
+            with st.container(border=True):
+                total_publications = stats['total_publications']
+                st.metric("Total Publications", f"{total_publications:,}")
+                avg_pubs = total_publications / total_researchers if total_researchers > 0 else 0
+                st.metric("Avg Publications", f"{avg_pubs:.1f}")
         
         with col4:
-            st.markdown('<div class="data-card">', unsafe_allow_html=True)
-            researchers_with_pubs = len(orcid_data[orcid_data['publications_count'] > 0]) if 'publications_count' in orcid_data.columns else 0
-            st.metric("Researchers with Publications", f"{researchers_with_pubs:,}")
-            pub_rate = (researchers_with_pubs / total_researchers) * 100 if total_researchers > 0 else 0
-            st.metric("Publication Rate", f"{pub_rate:.1f}%")
-            st.markdown('</div>', unsafe_allow_html=True)
+            with st.container(border=True):
+                researchers_with_pubs = stats['researchers_with_pubs']
+                st.metric("Researchers with Publications", f"{researchers_with_pubs:,}")
+                pub_rate = (researchers_with_pubs / total_researchers) * 100 if total_researchers > 0 else 0
+                st.metric("Publication Rate", f"{pub_rate:.1f}%")
         
         # Publication Details Overview
-        if not publication_details.empty:
-            total_publication_records = len(publication_details)
-            unique_publications, shared_removed, _ = count_unique_publications(publication_details)
+        if stats['total_publication_records'] > 0:
+            total_publication_records = stats['total_publication_records']
+            unique_publications = stats['unique_publications']
+            shared_removed = stats['shared_removed']
             
             col1, col2 = st.columns(2)
             
             with col1:
-                st.markdown('<div class="publication-details">', unsafe_allow_html=True)
-                st.metric("Total Publication Records", f"{total_publication_records:,}")
-                st.metric("Unique Publications", f"{unique_publications:,}")
-                st.markdown('</div>', unsafe_allow_html=True)
+                with st.container(border=True):
+                    st.metric("Total Publication Records", f"{total_publication_records:,}")
+                    st.metric("Unique Publications", f"{unique_publications:,}")
             
             with col2:
-                st.markdown('<div class="publication-details">', unsafe_allow_html=True)
-                publications_with_doi = len(publication_details[publication_details['doi'].notna() & (publication_details['doi'] != '')])
-                doi_percentage = (publications_with_doi / total_publication_records * 100) if total_publication_records > 0 else 0
-                
-                # Calculate shared publication rate
-                shared_rate = (shared_removed / total_publication_records * 100) if total_publication_records > 0 else 0
-                
-                st.metric("Publications with DOI", f"{publications_with_doi:,}")
-                st.metric("DOI Coverage", f"{doi_percentage:.1f}%")
-                st.metric("Shared Publications Removed", f"{shared_removed:,}")
-                st.markdown('</div>', unsafe_allow_html=True)
+                with st.container(border=True):
+                    publications_with_doi = stats['publications_with_doi']
+                    doi_percentage = (publications_with_doi / total_publication_records * 100) if total_publication_records > 0 else 0
+                    
+                    # Calculate shared publication rate
+                    shared_rate = (shared_removed / total_publication_records * 100) if total_publication_records > 0 else 0
+                    
+                    st.metric("Publications with DOI", f"{publications_with_doi:,}")
+                    st.metric("DOI Coverage", f"{doi_percentage:.1f}%")
+                    st.metric("Shared Publications Removed", f"{shared_removed:,}")
     else:
         st.error("❌ No research data found. Please ensure data_ORCIDs_CORRECTED.xlsx exists in the current directory.")
         return
@@ -594,8 +1053,8 @@ def main():
     
     try:
         # University filter - MULTIPLE SELECTION
-        st.sidebar.markdown('<div class="filter-section">', unsafe_allow_html=True)
-        university_options = ["All"] + sorted(orcid_data['university'].unique().tolist())
+        filter_options = get_filter_options(get_data_version())
+        university_options = ["All"] + filter_options['universities']
         selected_universities = st.sidebar.multiselect(
             "🏛️ Universities", 
             university_options,
@@ -605,14 +1064,12 @@ def main():
         # If "All" is selected with other options, keep only "All"
         if "All" in selected_universities and len(selected_universities) > 1:
             selected_universities = ["All"]
-        st.sidebar.markdown('</div>', unsafe_allow_html=True)
         
         # College filter - MULTIPLE SELECTION
-        st.sidebar.markdown('<div class="filter-section">', unsafe_allow_html=True)
         if "All" not in selected_universities and selected_universities:
-            college_options = ["All"] + sorted(orcid_data[orcid_data['university'].isin(selected_universities)]['college'].unique().tolist())
+            college_options = ["All"] + get_dependent_options(selected_universities, filter_options['colleges_by_university'])
         else:
-            college_options = ["All"] + sorted(orcid_data['college'].unique().tolist())
+            college_options = ["All"] + filter_options['colleges']
         
         selected_colleges = st.sidebar.multiselect(
             "🎓 Colleges", 
@@ -623,14 +1080,12 @@ def main():
         # If "All" is selected with other options, keep only "All"
         if "All" in selected_colleges and len(selected_colleges) > 1:
             selected_colleges = ["All"]
-        st.sidebar.markdown('</div>', unsafe_allow_html=True)
         
         # Department filter - MULTIPLE SELECTION
-        st.sidebar.markdown('<div class="filter-section">', unsafe_allow_html=True)
         if "All" not in selected_colleges and selected_colleges:
-            department_options = ["All"] + sorted(orcid_data[orcid_data['college'].isin(selected_colleges)]['department'].unique().tolist())
+            department_options = ["All"] + get_dependent_options(selected_colleges, filter_options['departments_by_college'])
         else:
-            department_options = ["All"] + sorted(orcid_data['department'].unique().tolist())
+            department_options = ["All"] + filter_options['departments']
         
         selected_departments = st.sidebar.multiselect(
             "📚 Departments", 
@@ -641,21 +1096,21 @@ def main():
         # If "All" is selected with other options, keep only "All"
         if "All" in selected_departments and len(selected_departments) > 1:
             selected_departments = ["All"]
-        st.sidebar.markdown('</div>', unsafe_allow_html=True)
         
         # Researcher filter - MULTIPLE SELECTION
-        st.sidebar.markdown('<div class="filter-section">', unsafe_allow_html=True)
         researcher_options = ["All"]
         
         if "All" not in selected_departments and selected_departments:
-            filtered_researchers = orcid_data[orcid_data['department'].isin(selected_departments)]
-            if "All" not in selected_colleges and selected_colleges:
-                filtered_researchers = filtered_researchers[filtered_researchers['college'].isin(selected_colleges)]
-            if "All" not in selected_universities and selected_universities:
-                filtered_researchers = filtered_researchers[filtered_researchers['university'].isin(selected_universities)]
-            researcher_options += sorted(filtered_researchers['name'].unique().tolist())
+            selected_keys = [
+                (university, college, department)
+                for university, college, department in filter_options['names_by_department']
+                if department in selected_departments
+                and ("All" in selected_colleges or not selected_colleges or college in selected_colleges)
+                and ("All" in selected_universities or not selected_universities or university in selected_universities)
+            ]
+            researcher_options += get_dependent_options(selected_keys, filter_options['names_by_department'])
         else:
-            researcher_options += sorted(orcid_data['name'].unique().tolist())
+            researcher_options += filter_options['names']
         
         selected_researchers = st.sidebar.multiselect(
             "👨‍🔬 Researchers", 
@@ -666,27 +1121,12 @@ def main():
         # If "All" is selected with other options, keep only "All"
         if "All" in selected_researchers and len(selected_researchers) > 1:
             selected_researchers = ["All"]
-        st.sidebar.markdown('</div>', unsafe_allow_html=True)
         
         # Year Range filter
-        st.sidebar.markdown('<div class="filter-section">', unsafe_allow_html=True)
         st.sidebar.markdown("**📅 Publication Year Range**")
         
         # Get available years from publication data
-        publication_df = get_publication_details()
-        if not publication_df.empty and 'year' in publication_df.columns:
-            # Convert to numeric and remove NaN values
-            years = pd.to_numeric(publication_df['year'], errors='coerce')
-            years = years.dropna().astype(int)
-            if len(years) > 0:
-                min_year = int(years.min())
-                max_year = int(years.max())
-            else:
-                min_year = 2000
-                max_year = datetime.now().year
-        else:
-            min_year = 2000
-            max_year = datetime.now().year
+        min_year, max_year = get_year_bounds(get_data_version())
         
         year_range = st.sidebar.slider(
             "Select year range",
@@ -695,13 +1135,10 @@ def main():
             value=(min_year, max_year),
             help="Filter publications by publication year"
         )
-        st.sidebar.markdown('</div>', unsafe_allow_html=True)
         
         # Data Status Filter
-        st.sidebar.markdown('<div class="data-filter-card">', unsafe_allow_html=True)
         data_filters = ["All Researchers", "Valid ORCID Only", "With Publications", "High Publication Count (10+)"]
         selected_data_filter = st.sidebar.selectbox("📊 Data Status", data_filters)
-        st.sidebar.markdown('</div>', unsafe_allow_html=True)
         
     except Exception as e:
         st.sidebar.error(f"Error loading filter data: {str(e)}")
@@ -711,56 +1148,40 @@ def main():
     
     # Active filters summary
     st.sidebar.markdown("---")
-    st.sidebar.markdown("### 📋 Active Filters")
-    st.sidebar.write(f"**Universities:** {', '.join(selected_universities) if selected_universities else 'All'}")
-    st.sidebar.write(f"**Colleges:** {', '.join(selected_colleges) if selected_colleges else 'All'}")
-    st.sidebar.write(f"**Departments:** {', '.join(selected_departments) if selected_departments else 'All'}")
-    st.sidebar.write(f"**Researchers:** {', '.join(selected_researchers) if selected_researchers else 'All'}")
-    st.sidebar.write(f"**Year Range:** {year_range[0]} - {year_range[1]}")
-    st.sidebar.write(f"**Data Status:** {selected_data_filter}")
+    # One markdown element for the whole summary (paragraph breaks keep the one-line-per-filter layout)
+    st.sidebar.markdown("\n\n".join([
+        "### 📋 Active Filters",
+        f"**Universities:** {', '.join(selected_universities) if selected_universities else 'All'}",
+        f"**Colleges:** {', '.join(selected_colleges) if selected_colleges else 'All'}",
+        f"**Departments:** {', '.join(selected_departments) if selected_departments else 'All'}",
+        f"**Researchers:** {', '.join(selected_researchers) if selected_researchers else 'All'}",
+        f"**Year Range:** {year_range[0]} - {year_range[1]}",
+        f"**Data Status:** {selected_data_filter}"
+    ]))
     
     # Refresh button
     st.sidebar.markdown("---")
     if st.sidebar.button("🔄 Refresh Data", use_container_width=True):
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.rerun()
     
-    # Get filtered data
-    researcher_metrics, totals = get_researcher_metrics(
-        selected_universities, selected_colleges, 
-        selected_departments, selected_researchers, 
-        selected_data_filter
-    )
-    
-    # Get filtered publication details with year range
-    filtered_publications = get_filtered_publication_details(
-        selected_universities, selected_colleges,
-        selected_departments, selected_researchers,
-        selected_data_filter, year_range
-    )
-    
-    # Calculate unique publications for filtered data
-    unique_filtered_publications, shared_removed, unique_publications_df = count_unique_publications(filtered_publications)
-    
-    # Get comprehensive filtered performance metrics (NOW RESPECTS YEAR RANGE)
-    performance_metrics = get_filtered_performance_metrics(
-        selected_universities, selected_colleges,
-        selected_departments, selected_researchers,
-        selected_data_filter, year_range
-    )
-    
-    # Get college and department performance data
-    college_performance = get_college_performance_over_years(
+    # Filter once and derive everything the main view needs (cached per filter selection and data file version)
+    context = get_dashboard_context(
         selected_universities, selected_colleges,
         selected_departments, selected_researchers,
-        selected_data_filter, year_range
-    )
-    
-    department_performance = get_department_performance_over_years(
-        selected_universities, selected_colleges,
-        selected_departments, selected_researchers,
-        selected_data_filter, year_range
+        selected_data_filter, year_range, get_data_version()
     )
+    filtered_data = context['filtered_data']
+    researcher_metrics = context['researcher_metrics']
+    filtered_publications = context['filtered_publications']
+    publication_counts = context['publication_counts']
+    year_filtered_publications = context['year_filtered_publications']
+    unique_filtered_publications = context['unique_publications']
+    shared_removed = context['shared_removed']
+    performance_metrics = context['performance_metrics']
+    college_performance = context['college_performance']
+    department_performance = context['department_performance']
     
     # Main dashboard content
     if not researcher_metrics.empty:
@@ -771,32 +1192,27 @@ def main():
         col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Total Publications", f"{performance_metrics['total_publications']:,}")
-            st.metric("Unique Publications", f"{performance_metrics['unique_publications']:,}")
-            st.markdown("</div>", unsafe_allow_html=True)
+            with st.container(border=True):
+                st.metric("Total Publications", f"{performance_metrics['total_publications']:,}")
+                st.metric("Unique Publications", f"{performance_metrics['unique_publications']:,}")
         
         with col2:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Total Researchers", f"{performance_metrics['total_researchers']:,}")
-            st.metric("Researchers with Publications", f"{performance_metrics['researchers_with_publications']:,}")
-            st.markdown("</div>", unsafe_allow_html=True)
+            with st.container(border=True):
+                st.metric("Total Researchers", f"{performance_metrics['total_researchers']:,}")
+                st.metric("Researchers with Publications", f"{performance_metrics['researchers_with_publications']:,}")
         
         with col3:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Avg Publications", f"{performance_metrics['average_publications']:.1f}")
-            st.metric("Publication Rate", f"{performance_metrics['publication_rate']:.1f}%")
-            st.markdown("</div>", unsafe_allow_html=True)
+            with st.container(border=True):
+                st.metric("Avg Publications", f"{performance_metrics['average_publications']:.1f}")
+                st.metric("Publication Rate", f"{performance_metrics['publication_rate']:.1f}%")
         
         with col4:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Data Quality", f"{performance_metrics['data_quality']:.1f}%")
-            st.markdown("</div>", unsafe_allow_html=True)
+            with st.container(border=True):
+                st.metric("Data Quality", f"{performance_metrics['data_quality']:.1f}%")
         
         with col5:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Shared Publications Removed", f"{performance_metrics['shared_publications_removed']:,}")
-            st.markdown("</div>", unsafe_allow_html=True)
+            with st.container(border=True):
+                st.metric("Shared Publications Removed", f"{performance_metrics['shared_publications_removed']:,}")
         
         # Show shared publication info if applicable
         if shared_removed > 0:
@@ -809,363 +1225,117 @@ def main():
             col1, col2 = st.columns(2)
             
             with col1:
-                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                st.markdown("#### 🏫 College Performance Over Years")
-                
-                if not college_performance.empty:
-                    fig = px.line(
-                        college_performance,
-                        x='year_numeric',
-                        y='publications',
-                        color='college',
-                        title="College Publication Trends Over Years",
-                        markers=True
-                    )
-                    fig.update_layout(
-                        height=400,
-                        xaxis_title="Year",
-                        yaxis_title="Number of Publications",
-                        legend_title="College"
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("No college performance data available for current filters")
-                st.markdown('</div>', unsafe_allow_html=True)
+                with chart_container("#### 🏫 College Performance Over Years"):
+                    if not college_performance.empty:
+                        fig = _build_trend_chart(
+                            college_performance, 'college',
+                            "College Publication Trends Over Years", "College"
+                        )
+                        plotly_chart(fig, 'college_performance')
+                    else:
+                        st.info("No college performance data available for current filters")
             
             with col2:
-                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                st.markdown("#### 📚 Department Performance Over Years")
-                
-                if not department_performance.empty:
-                    # Limit to top 10 departments for better visualization
-                    top_departments = department_performance.groupby('department')['publications'].sum().nlargest(10).index
-                    filtered_department_performance = department_performance[department_performance['department'].isin(top_departments)]
-                    
-                    fig = px.line(
-                        filtered_department_performance,
-                        x='year_numeric',
-                        y='publications',
-                        color='department',
-                        title="Top 10 Department Publication Trends Over Years",
-                        markers=True
-                    )
-                    fig.update_layout(
-                        height=400,
-                        xaxis_title="Year",
-                        yaxis_title="Number of Publications",
-                        legend_title="Department"
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("No department performance data available for current filters")
-                st.markdown('</div>', unsafe_allow_html=True)
+                with chart_container("#### 📚 Department Performance Over Years"):
+                    if not department_performance.empty:
+                        # Already limited to the top 10 departments by the dashboard context
+                        fig = _build_trend_chart(
+                            department_performance, 'department',
+                            "Top 10 Department Publication Trends Over Years", "Department"
+                        )
+                        plotly_chart(fig, 'department_performance')
+                    else:
+                        st.info("No department performance data available for current filters")
         
         # Analytics Visualizations
         st.markdown("### 📊 Research Analytics")
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.markdown("#### 📈 Publication Distribution")
-            
-            # Publication count distribution - use year-filtered data
-            if not filtered_publications.empty:
-                # Create researcher metrics based on year-filtered publication counts
-                year_filtered_researcher_counts = filtered_publications.groupby('researcher_name').size().reset_index(name='year_filtered_publications')
-                researcher_metrics_year_filtered = researcher_metrics.merge(
-                    year_filtered_researcher_counts, 
-                    left_on='name', 
-                    right_on='researcher_name', 
-                    how='left'
-                )
-                researcher_metrics_year_filtered['year_filtered_publications'] = researcher_metrics_year_filtered['year_filtered_publications'].fillna(0)
-                
-                fig = px.histogram(
-                    researcher_metrics_year_filtered, 
-                    x='year_filtered_publications',
-                    nbins=20,
-                    title="Distribution of Publication Counts (Year Filtered)",
-                    color_discrete_sequence=['#00A36C']
-                )
-            else:
-                fig = px.histogram(
-                    researcher_metrics, 
-                    x='publications',
-                    nbins=20,
-                    title="Distribution of Publication Counts",
-                    color_discrete_sequence=['#00A36C']
-                )
-            fig.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+            with chart_container("#### 📈 Publication Distribution"):
+                # Publication count distribution - use year-filtered data
+                if not filtered_publications.empty:
+                    # Year-filtered publication count per researcher, mapped once in the dashboard context
+                    fig = _build_publication_histogram(
+                        tuple(year_filtered_publications.tolist()),
+                        'year_filtered_publications',
+                        "Distribution of Publication Counts (Year Filtered)"
+                    )
+                else:
+                    fig = _build_publication_histogram(
+                        tuple(researcher_metrics['publications'].tolist()),
+                        'publications',
+                        "Distribution of Publication Counts"
+                    )
+                plotly_chart(fig, 'publication_distribution')
         
         with col2:
-            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.markdown("#### 📊 Publications by Department")
-            
-            # Top departments by publications - use year-filtered data
-            if not filtered_publications.empty:
-                dept_publications = filtered_publications.groupby('department').size().reset_index(name='publications')
-                dept_publications = dept_publications.sort_values('publications', ascending=False).head(10)
-                title = "Top Departments by Publications (Year Filtered)"
-            else:
-                dept_publications = researcher_metrics.groupby('department')['publications'].sum().reset_index()
-                dept_publications = dept_publications.sort_values('publications', ascending=False).head(10)
-                title = "Top Departments by Publications"
-            
-            if not dept_publications.empty:
-                fig = px.bar(
-                    dept_publications,
-                    x='publications',
-                    y='department',
-                    orientation='h',
-                    color='publications',
-                    color_continuous_scale='viridis',
-                    title=title
-                )
-                fig.update_layout(height=400, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No department data available for current filters")
-            st.markdown('</div>', unsafe_allow_html=True)
+            with chart_container("#### 📊 Publications by Department"):
+                # Top departments by publications - use year-filtered data
+                if not filtered_publications.empty:
+                    dept_publications = filtered_publications.groupby('department', observed=True).size().reset_index(name='publications')
+                    dept_publications = dept_publications.sort_values('publications', ascending=False).head(10)
+                    title = "Top Departments by Publications (Year Filtered)"
+                else:
+                    dept_publications = researcher_metrics.groupby('department', observed=True)['publications'].sum().reset_index()
+                    dept_publications = dept_publications.sort_values('publications', ascending=False).head(10)
+                    title = "Top Departments by Publications"
+                
+                if not dept_publications.empty:
+                    fig = _build_department_bar(
+                        tuple(dept_publications[['department', 'publications']].itertuples(index=False, name=None)),
+                        title
+                    )
+                    plotly_chart(fig, 'top_departments')
+                else:
+                    st.info("No department data available for current filters")
         
         # Validation Status
         st.markdown("### 🎯 Data Validation Status")
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.markdown("#### ✅ Profile Validation Overview")
-            
-            filtered_data = get_filtered_orcid_data(selected_universities, selected_colleges, 
-                                                  selected_departments, selected_researchers, 
-                                                  selected_data_filter)
-            
-            if not filtered_data.empty and 'orcid_valid' in filtered_data.columns:
-                validation_counts = filtered_data['orcid_valid'].value_counts()
-                fig = px.pie(
-                    values=validation_counts.values,
-                    names=['Valid Profile' if x else 'Invalid Profile' for x in validation_counts.index],
-                    title="Profile Validation Status",
-                    color_discrete_sequence=['#00A36C', '#FF6B6B']
-                )
-                fig.update_layout(height=400)
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No validation data available for current filters")
-            st.markdown('</div>', unsafe_allow_html=True)
+            with chart_container("#### ✅ Profile Validation Overview"):
+                if not filtered_data.empty and 'orcid_valid' in filtered_data.columns:
+                    validation_counts = filtered_data['orcid_valid'].value_counts()
+                    fig = _build_validation_pie(
+                        tuple(validation_counts.tolist()),
+                        tuple('Valid Profile' if x else 'Invalid Profile' for x in validation_counts.index)
+                    )
+                    plotly_chart(fig, 'profile_validation')
+                else:
+                    st.info("No validation data available for current filters")
         
         with col2:
-            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.markdown("#### 📋 Department-wise Validation")
-            
-            filtered_data = get_filtered_orcid_data(selected_universities, selected_colleges, 
-                                                  selected_departments, selected_researchers, 
-                                                  selected_data_filter)
-            
-            if not filtered_data.empty and 'orcid_valid' in filtered_data.columns:
-                dept_validation = filtered_data.groupby('department').agg({
-                    'orcid_valid': ['sum', 'count']
-                }).reset_index()
-                dept_validation.columns = ['department', 'valid_count', 'total_count']
-                dept_validation['invalid_count'] = dept_validation['total_count'] - dept_validation['valid_count']
-                dept_validation = dept_validation.head(10)  # Top 10 departments
-                
-                fig = go.Figure(data=[
-                    go.Bar(name='Valid Profile', y=dept_validation['department'], 
-                          x=dept_validation['valid_count'], orientation='h', marker_color='#00A36C'),
-                    go.Bar(name='Invalid Profile', y=dept_validation['department'], 
-                          x=dept_validation['invalid_count'], orientation='h', marker_color='#FF6B6B')
-                ])
-                fig.update_layout(barmode='stack', height=400, title="Profile Validation by Department")
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No validation data available for current filters")
-            st.markdown('</div>', unsafe_allow_html=True)
+            with chart_container("#### 📋 Department-wise Validation"):
+                if not filtered_data.empty and 'orcid_valid' in filtered_data.columns:
+                    dept_validation = (
+                        filtered_data.groupby('department', observed=True)['orcid_valid']
+                        .agg(valid_count='sum', total_count='count')
+                        .nlargest(10, 'total_count')  # Top 10 departments
+                        .reset_index()
+                    )
+                    dept_validation['invalid_count'] = dept_validation['total_count'] - dept_validation['valid_count']
+                    
+                    fig = go.Figure(data=[
+                        go.Bar(name='Valid Profile', y=dept_validation['department'], 
+                              x=dept_validation['valid_count'], orientation='h', marker_color='#00A36C'),
+                        go.Bar(name='Invalid Profile', y=dept_validation['department'], 
+                              x=dept_validation['invalid_count'], orientation='h', marker_color='#FF6B6B')
+                    ])
+                    fig.update_layout(barmode='stack', height=400, title="Profile Validation by Department")
+                    plotly_chart(fig, 'department_validation')
+                else:
+                    st.info("No validation data available for current filters")
         
         # Top Researchers Section - use year-filtered data
-        st.markdown("### 🏆 Top Researchers by Publication Count")
-        
-        # Use year-filtered publication counts for rankings
-        if not filtered_publications.empty:
-            year_filtered_researcher_counts = filtered_publications.groupby('researcher_name').size().reset_index(name='year_filtered_publications')
-            top_researchers = year_filtered_researcher_counts.nlargest(10, 'year_filtered_publications')
-            chart_title = "Top 10 Researchers by Publication Count (Year Filtered)"
-            publications_column = 'year_filtered_publications'
-        else:
-            top_researchers = researcher_metrics.nlargest(10, 'publications')
-            chart_title = "Top 10 Researchers by Publication Count"
-            publications_column = 'publications'
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            if not top_researchers.empty:
-                fig = px.bar(
-                    top_researchers,
-                    x=publications_column,
-                    y='researcher_name' if 'researcher_name' in top_researchers.columns else 'name',
-                    orientation='h',
-                    color=publications_column,
-                    color_continuous_scale='viridis',
-                    title=chart_title
-                )
-                fig.update_layout(height=500, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No researcher data available for current filters")
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.markdown("#### 🥇 Researcher Rankings")
-            
-            if not top_researchers.empty:
-                for i, (_, researcher) in enumerate(top_researchers.iterrows(), 1):
-                    medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-                    researcher_name = researcher['researcher_name'] if 'researcher_name' in researcher else researcher['name']
-                    publications_count = researcher[publications_column]
-                    
-                    st.markdown(f"""
-                    <div style='padding: 0.5rem; margin: 0.2rem 0; background: #f8f9fa; border-radius: 8px;'>
-                        <strong>{medal} {researcher_name}</strong><br>
-                        <span style='color: #2e7d32; font-weight: bold;'>📄 {publications_count} publications</span>
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.info("No researcher rankings available")
-            st.markdown('</div>', unsafe_allow_html=True)
+        _render_top_researchers(publication_counts, researcher_metrics)
         
         # Publication Details Table - Show ALL publications (with shared publications)
-        if not filtered_publications.empty:
-            st.markdown("### 📖 Publication Details")
-            
-            # Create display dataframe for publication details (ALL records)
-            publication_display_df = filtered_publications.copy()
-            
-            # Select and rename columns for display
-            display_columns = ['researcher_name', 'title', 'journal', 'year', 'doi']
-            available_columns = [col for col in display_columns if col in publication_display_df.columns]
-            
-            publication_display_df = publication_display_df[available_columns]
-            
-            # Rename columns for better display
-            column_rename_map = {
-                'researcher_name': 'Researcher Name',
-                'title': 'Publication Title',
-                'journal': 'Journal/Conference',
-                'year': 'Year',
-                'doi': 'DOI'
-            }
-            
-            # Only rename columns that exist
-            final_rename_map = {k: v for k, v in column_rename_map.items() if k in publication_display_df.columns}
-            publication_display_df = publication_display_df.rename(columns=final_rename_map)
-            
-            # Clean up data
-            if 'Year' in publication_display_df.columns:
-                publication_display_df['Year'] = publication_display_df['Year'].fillna('N/A')
-                # Convert to string and clean up
-                publication_display_df['Year'] = publication_display_df['Year'].astype(str).str.replace('.0', '', regex=False)
-            
-            if 'DOI' in publication_display_df.columns:
-                publication_display_df['DOI'] = publication_display_df['DOI'].fillna('No DOI')
-                # Truncate long DOIs for better display
-                publication_display_df['DOI'] = publication_display_df['DOI'].apply(
-                    lambda x: x[:50] + '...' if len(str(x)) > 50 and x != 'No DOI' else x
-                )
-            
-            if 'Publication Title' in publication_display_df.columns:
-                publication_display_df['Publication Title'] = publication_display_df['Publication Title'].fillna('Unknown Title')
-                # Truncate long titles for better display
-                publication_display_df['Publication Title'] = publication_display_df['Publication Title'].apply(
-                    lambda x: x[:100] + '...' if len(str(x)) > 100 else x
-                )
-            
-            if 'Journal/Conference' in publication_display_df.columns:
-                publication_display_df['Journal/Conference'] = publication_display_df['Journal/Conference'].fillna('Unknown')
-                # Truncate long journal names
-                publication_display_df['Journal/Conference'] = publication_display_df['Journal/Conference'].apply(
-                    lambda x: x[:80] + '...' if len(str(x)) > 80 else x
-                )
-            
-            st.markdown(f"**Showing {len(publication_display_df)} publication records ({unique_filtered_publications} unique publications after shared publication removal)**")
-            
-            st.markdown('<div class="dataframe">', unsafe_allow_html=True)
-            st.dataframe(
-                publication_display_df.sort_values('Year', ascending=False),
-                use_container_width=True,
-                height=400
-            )
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Export option for publication details (ALL records)
-            pub_csv = publication_display_df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Publication Details as CSV",
-                data=pub_csv,
-                file_name=f"publication_details_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-        else:
-            st.info("📖 No publication details available for the selected filters.")
+        _render_publication_details(filtered_publications, unique_filtered_publications, today_tag)
         
         # Detailed Researcher Data Table
-        st.markdown("### 📋 Detailed Researcher Data")
-        
-        filtered_data = get_filtered_orcid_data(selected_universities, selected_colleges, 
-                                              selected_departments, selected_researchers, 
-                                              selected_data_filter)
-        
-        if not filtered_data.empty:
-            try:
-                # Create display dataframe
-                display_columns = ['name', 'department', 'college', 'orcid', 'publications_count']
-                if 'orcid_valid' in filtered_data.columns:
-                    display_columns.append('orcid_valid')
-                
-                display_df = filtered_data[display_columns].copy()
-                
-                # Rename for clarity
-                column_rename_map = {
-                    'name': 'Researcher Name',
-                    'department': 'Department',
-                    'college': 'College', 
-                    'orcid': 'Profile ID',
-                    'publications_count': 'Publications',
-                    'orcid_valid': 'Profile Valid'
-                }
-                
-                # Only rename columns that exist
-                final_rename_map = {k: v for k, v in column_rename_map.items() if k in display_df.columns}
-                display_df = display_df.rename(columns=final_rename_map)
-                
-                # Format Profile Valid column if it exists
-                if 'Profile Valid' in display_df.columns:
-                    display_df['Profile Valid'] = display_df['Profile Valid'].map({True: '✅ Yes', False: '❌ No'})
-                
-                st.markdown('<div class="dataframe">', unsafe_allow_html=True)
-                st.dataframe(
-                    display_df.sort_values('Publications', ascending=False),
-                    use_container_width=True,
-                    height=400
-                )
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-                # Export option
-                csv = display_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download Research Data as CSV",
-                    data=csv,
-                    file_name=f"research_analytics_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-                
-            except Exception as e:
-                st.error(f"Error preparing detailed data: {str(e)}")
+        _render_detailed_data(filtered_data, today_tag)
         
     else:
         st.warning("""
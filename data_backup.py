@@ -1,10 +1,52 @@
 # data_backup.py
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as papq
 import os
+import importlib.util
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 
+try:
+    import orjson
+    json_loads = orjson.loads
+    
+    def json_dump(obj, path):
+        """Write obj to path as indented JSON"""
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+except ImportError:
+    json_loads = json.loads
+    
+    def json_dump(obj, path):
+        """Write obj to path as indented JSON"""
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
+if importlib.util.find_spec("xlsxwriter") is not None:
+    # Stream rows to disk instead of holding the whole workbook in memory
+    XLSX_WRITER_KWARGS = {"engine": "xlsxwriter", "engine_kwargs": {"options": {"constant_memory": True}}}
+else:
+    XLSX_WRITER_KWARGS = {}
+
+def json_load(path):
+    """Read a JSON file"""
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+def _fast_copy(src, dst):
+    """Copy a file in-kernel when possible, preserving metadata like shutil.copy2"""
+    with open(src, "rb") as fi, open(dst, "wb") as fo:
+        try:
+            while os.copy_file_range(fi.fileno(), fo.fileno(), 1 << 30):
+                pass
+        except (AttributeError, OSError):
+            shutil.copyfileobj(fi, fo, length=1 << 20)
+    shutil.copystat(src, dst)
+    return dst
+
 def create_data_backup():
     """Create comprehensive backups of ORCID data files"""
     
@@ -29,16 +71,21 @@ def create_data_backup():
         
         backed_up_files = []
         
-        # Backup each file if it exists
+        # Backup each file if it exists (copies run in parallel)
+        existing_files = []
         for file_name in files_to_backup:
             if os.path.exists(file_name):
-                # Copy the file
-                shutil.copy2(file_name, os.path.join(backup_dir, file_name))
-                backed_up_files.append(file_name)
-                print(f"✅ Backed up: {file_name}")
+                existing_files.append(file_name)
             else:
                 print(f"⚠️  File not found: {file_name}")
         
+        if existing_files:
+            with ThreadPoolExecutor(max_workers=len(existing_files)) as executor:
+                destinations = [os.path.join(backup_dir, file_name) for file_name in existing_files]
+                for file_name, _ in zip(existing_files, executor.map(_fast_copy, existing_files, destinations)):
+                    backed_up_files.append(file_name)
+                    print(f"✅ Backed up: {file_name}")
+        
         # Create backup info file
         backup_info = {
             "backup_timestamp": timestamp,
@@ -48,8 +95,7 @@ def create_data_backup():
         }
         
         # Save backup info
-        with open(os.path.join(backup_dir, "backup_info.json"), "w") as f:
-            json.dump(backup_info, f, indent=2)
+        json_dump(backup_info, os.path.join(backup_dir, "backup_info.json"))
         
         print(f"\n📊 BACKUP SUMMARY:")
         print(f"   📁 Backup location: {backup_dir}")
@@ -73,19 +119,18 @@ def cleanup_old_backups(keep_count=10):
         return
     
     try:
-        # Get all backup directories
-        backup_dirs = []
-        for item in os.listdir(backup_root):
-            item_path = os.path.join(backup_root, item)
-            if os.path.isdir(item_path) and item.startswith("backup_"):
-                backup_dirs.append((item_path, os.path.getctime(item_path)))
-        
-        # Sort by creation time (newest first)
-        backup_dirs.sort(key=lambda x: x[1], reverse=True)
+        # Get all backup directories, newest first (backup_YYYYMMDD_HHMMSS sorts chronologically)
+        with os.scandir(backup_root) as entries:
+            backup_names = sorted(
+                (entry.name for entry in entries
+                 if entry.name.startswith("backup_") and entry.is_dir(follow_symlinks=False)),
+                reverse=True
+            )
         
         # Remove old backups
-        if len(backup_dirs) > keep_count:
-            for backup_path, _ in backup_dirs[keep_count:]:
+        if len(backup_names) > keep_count:
+            for backup_name in backup_names[keep_count:]:
+                backup_path = os.path.join(backup_root, backup_name)
                 shutil.rmtree(backup_path)
                 print(f"🗑️  Removed old backup: {os.path.basename(backup_path)}")
                 
@@ -105,14 +150,17 @@ def list_available_backups():
         print("\n📋 AVAILABLE BACKUPS:")
         print("-" * 40)
         
-        for item in sorted(os.listdir(backup_root), reverse=True):
-            item_path = os.path.join(backup_root, item)
-            if os.path.isdir(item_path) and item.startswith("backup_"):
+        with os.scandir(backup_root) as entries:
+            backup_entries = sorted(entries, key=lambda entry: entry.name, reverse=True)
+        
+        for entry in backup_entries:
+            item = entry.name
+            item_path = entry.path
+            if item.startswith("backup_") and entry.is_dir():
                 # Read backup info
                 info_file = os.path.join(item_path, "backup_info.json")
                 if os.path.exists(info_file):
-                    with open(info_file, "r") as f:
-                        info = json.load(f)
+                    info = json_load(info_file)
                     file_count = len(info.get("files_backed_up", []))
                     timestamp = info.get("backup_timestamp", "Unknown")
                     print(f"📁 {item}")
@@ -153,8 +201,7 @@ def restore_from_backup(backup_name=None):
         # Read backup info
         info_file = os.path.join(backup_path, "backup_info.json")
         if os.path.exists(info_file):
-            with open(info_file, "r") as f:
-                info = json.load(f)
+            info = json_load(info_file)
             files_available = info.get("files_backed_up", [])
         else:
             # If no info file, list all .xlsx files in backup
@@ -191,7 +238,17 @@ def restore_from_backup(backup_name=None):
     except Exception as e:
         print(f"❌ Restore failed: {e}")
 
-def export_publication_data():
+def _parse_publication_details(value):
+    """Parse a publication_details cell, falling back to an empty list"""
+    details_str = str(value).strip()
+    if not details_str or details_str in ('nan', 'None'):
+        return []
+    try:
+        return json_loads(details_str)
+    except Exception:
+        return []
+
+def export_publication_data(include_xlsx=True):
     """Export publication data to multiple formats for additional backup"""
     
     print("📤 EXPORT PUBLICATION DATA")
@@ -212,28 +269,29 @@ def export_publication_data():
             formats = {
                 'csv': f"{export_dir}/orcid_data_{timestamp}.csv",
                 'json': f"{export_dir}/orcid_data_{timestamp}.json",
-                'xlsx': f"{export_dir}/orcid_data_{timestamp}.xlsx"
+                'parquet': f"{export_dir}/orcid_data_{timestamp}.parquet"
             }
+            if include_xlsx:
+                formats['xlsx'] = f"{export_dir}/orcid_data_{timestamp}.xlsx"
             
             # Export main data
             df.to_csv(formats['csv'], index=False)
-            df.to_excel(formats['xlsx'], index=False)
+            # Arrow needs one type per column, so mixed-type object columns (e.g. a numeric ORCID cell) become strings
+            object_columns = df.select_dtypes(include='object').columns
+            table = pa.Table.from_pandas(df.astype({col: 'string' for col in object_columns}), preserve_index=False)
+            papq.write_table(table, formats['parquet'], compression="zstd")
+            if include_xlsx:
+                df.to_excel(formats['xlsx'], index=False, **XLSX_WRITER_KWARGS)
             
-            # For JSON, handle the publication_details column
-            json_data = df.to_dict('records')
-            for record in json_data:
-                if 'publication_details' in record and pd.notna(record['publication_details']):
-                    try:
-                        details_str = str(record['publication_details']).strip()
-                        if details_str and details_str != 'nan' and details_str != 'None':
-                            record['publication_details'] = json.loads(details_str)
-                        else:
-                            record['publication_details'] = []
-                    except:
-                        record['publication_details'] = []
+            # For JSON, parse the publication_details column once before building records
+            json_df = df
+            if 'publication_details' in df.columns:
+                json_df = df.assign(publication_details=df['publication_details'].map(
+                    _parse_publication_details, na_action='ignore'
+                ))
+            json_data = json_df.to_dict('records')
             
-            with open(formats['json'], 'w') as f:
-                json.dump(json_data, f, indent=2)
+            json_dump(json_data, formats['json'])
             
             print("✅ Data exported to multiple formats:")
             for fmt, path in formats.items():
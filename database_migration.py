@@ -10,11 +10,18 @@ logger = logging.getLogger(__name__)
 class DatabaseMigrator:
     def __init__(self):
         self.db_engine = create_engine(Config.DATABASE_URL)
+        self._inspector = None
+    
+    def _get_inspector(self):
+        """Return the cached schema inspector, creating it after DDL or on first use"""
+        if self._inspector is None:
+            self._inspector = inspect(self.db_engine)
+        return self._inspector
     
     def check_current_schema(self):
         """Check the current database schema"""
         try:
-            inspector = inspect(self.db_engine)
+            inspector = self._get_inspector()
             tables = inspector.get_table_names()
             
             logger.info("📊 Current Database Schema:")
@@ -36,25 +43,33 @@ class DatabaseMigrator:
                 trans = conn.begin()
                 try:
                     # Check if columns exist
-                    inspector = inspect(self.db_engine)
+                    inspector = self._get_inspector()
                     existing_columns = [col['name'] for col in inspector.get_columns('researchers')]
                     
-                    # Add orcid_valid column if it doesn't exist
-                    if 'orcid_valid' not in existing_columns:
-                        logger.info("➕ Adding 'orcid_valid' column to researchers table...")
-                        conn.execute(text("ALTER TABLE researchers ADD COLUMN orcid_valid BOOLEAN DEFAULT FALSE"))
-                    
-                    # Add publications_count column if it doesn't exist
-                    if 'publications_count' not in existing_columns:
-                        logger.info("➕ Adding 'publications_count' column to researchers table...")
-                        conn.execute(text("ALTER TABLE researchers ADD COLUMN publications_count INTEGER DEFAULT 0"))
+                    # Columns to add if they don't exist (email kept for backward compatibility)
+                    missing_columns = [
+                        (name, definition) for name, definition in [
+                            ('orcid_valid', "BOOLEAN DEFAULT FALSE"),
+                            ('publications_count', "INTEGER DEFAULT 0"),
+                            ('email', "TEXT DEFAULT ''")
+                        ]
+                        if name not in existing_columns
+                    ]
+                    for name, _ in missing_columns:
+                        logger.info(f"➕ Adding '{name}' column to researchers table...")
                     
-                    # Add email column if it doesn't exist (for backward compatibility)
-                    if 'email' not in existing_columns:
-                        logger.info("➕ Adding 'email' column to researchers table...")
-                        conn.execute(text("ALTER TABLE researchers ADD COLUMN email TEXT DEFAULT ''"))
+                    if missing_columns:
+                        if self.db_engine.dialect.name in ('postgresql', 'mysql'):
+                            # Add all columns in a single ALTER TABLE round-trip
+                            add_clauses = ", ".join(f"ADD COLUMN {name} {definition}" for name, definition in missing_columns)
+                            conn.execute(text(f"ALTER TABLE researchers {add_clauses}"))
+                        else:
+                            # SQLite only supports one ADD COLUMN per ALTER TABLE
+                            for name, definition in missing_columns:
+                                conn.execute(text(f"ALTER TABLE researchers ADD COLUMN {name} {definition}"))
                     
                     trans.commit()
+                    self._inspector = None
                     logger.info("✅ Successfully migrated researchers table")
                     return True
                     
@@ -127,6 +142,7 @@ class DatabaseMigrator:
                     """))
                     
                     trans.commit()
+                    self._inspector = None
                     logger.info("✅ Successfully created/verified all tables")
                     return True
                     
@@ -147,25 +163,30 @@ class DatabaseMigrator:
             with self.db_engine.connect() as conn:
                 trans = conn.begin()
                 try:
-                    # Clear existing researchers
-                    conn.execute(text("DELETE FROM researchers"))
+                    # Clear existing researchers (an unqualified DELETE is SQLite's truncate fast path;
+                    # TRUNCATE ... CASCADE elsewhere would also wipe publications and metrics_snapshots)
+                    conn.exec_driver_sql("DELETE FROM researchers")
                     
-                    # Insert all researchers from corrected file
-                    for _, row in orcid_df.iterrows():
-                        insert_query = text("""
-                        INSERT INTO researchers (name, orcid, department, college, university, email, orcid_valid, publications_count)
-                        VALUES (:name, :orcid, :department, :college, :university, :email, :orcid_valid, :publications_count)
-                        """)
-                        conn.execute(insert_query, {
-                            'name': row['name'],
-                            'orcid': row['orcid'],
-                            'department': row.get('department', ''),
-                            'college': row.get('college', ''),
-                            'university': row.get('university', ''),
-                            'email': row.get('email', ''),
-                            'orcid_valid': row.get('orcid_valid', False),
-                            'publications_count': row.get('publications_count', 0)
-                        })
+                    # Insert all researchers from corrected file in one executemany batch
+                    insert_query = text("""
+                    INSERT INTO researchers (name, orcid, department, college, university, email, orcid_valid, publications_count)
+                    VALUES (:name, :orcid, :department, :college, :university, :email, :orcid_valid, :publications_count)
+                    """)
+                    defaults = {
+                        'department': '',
+                        'college': '',
+                        'university': '',
+                        'email': '',
+                        'orcid_valid': False,
+                        'publications_count': 0
+                    }
+                    records_df = orcid_df[['name', 'orcid']].copy()
+                    for column, default in defaults.items():
+                        records_df[column] = orcid_df[column] if column in orcid_df.columns else default
+                    records_df = records_df.astype(object).where(records_df.notna(), None)
+                    records = records_df.to_dict('records')
+                    if records:
+                        conn.execute(insert_query, records)
                     
                     trans.commit()
                     logger.info(f"✅ Synced {len(orcid_df)} researchers to database")
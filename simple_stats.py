@@ -3,11 +3,20 @@ import pandas as pd
 import json
 import os
 
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 def simple_orcid_stats():
     """Super simple statistics display using only data_ORCIDs_CORRECTED.xlsx"""
     try:
         # Load only the corrected database
-        df = pd.read_excel("data_ORCIDs_CORRECTED.xlsx")
+        df = pd.read_excel(
+            "data_ORCIDs_CORRECTED.xlsx",
+            usecols=lambda col: col in ('orcid_valid', 'publications_count', 'publication_details')
+        )
         
         print("📊 ORCID STATISTICS - data_ORCIDs_CORRECTED.xlsx")
         print("=" * 50)
@@ -19,18 +28,18 @@ def simple_orcid_stats():
         
         # Count unique publications using DOI
         unique_dois = set()
-        for idx, row in df.iterrows():
-            if row['orcid_valid'] and pd.notna(row.get('publication_details', '')):
-                try:
-                    pubs_str = str(row['publication_details']).strip()
-                    if pubs_str and pubs_str != 'nan' and pubs_str != 'None':
-                        pubs = json.loads(pubs_str)
+        if 'publication_details' in df.columns:
+            details = df.loc[df['orcid_valid'].astype(bool) & df['publication_details'].notna(), 'publication_details']
+            for pubs_str in details.astype(str).str.strip():
+                if pubs_str and pubs_str != 'nan' and pubs_str != 'None':
+                    try:
+                        pubs = json_loads(pubs_str)
                         for pub in pubs:
                             doi = pub.get('doi', '')
                             if doi and doi.strip():
                                 unique_dois.add(doi.lower().strip())
-                except:
-                    pass
+                    except:
+                        pass
         
         # Display results
         print(f"👥 Total Researchers: {total_researchers}")